@@ -0,0 +1,37 @@
+"""
+Logging configuration for Bytez API Key Scraper
+Writes log records to stdout from a background thread
+"""
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from . import settings
+
+
+def setup_logging(level: str = None) -> QueueListener:
+    """
+    Route all log records through a queue to a background writer thread.
+    Logging calls only enqueue the record; the stdout write happens on the
+    listener thread, off the scraper's event loop.
+
+    Args:
+        level: Root log level name (defaults to settings.LOG_LEVEL)
+
+    Returns:
+        The started QueueListener (stopped automatically at exit)
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    root = logging.getLogger()
+    root.setLevel((level or settings.LOG_LEVEL).upper())
+    root.handlers[:] = [QueueHandler(log_queue)]
+
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
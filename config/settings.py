@@ -7,11 +7,12 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Base directory of the project (absolute() avoids resolve()'s realpath syscalls)
+BASE_DIR = Path(__file__).absolute().parent.parent
 
-# Base directory of the project
-BASE_DIR = Path(__file__).resolve().parent.parent
+# Load environment variables from .env file
+# An explicit path skips find_dotenv's stack inspection and directory walk
+load_dotenv(BASE_DIR / ".env")
 
 # ==================== MONGODB CONFIGURATION ====================
 
@@ -19,21 +20,45 @@ MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 MONGODB_DATABASE = os.getenv("MONGODB_DATABASE", "bytez_keys_manager")
 MONGODB_COLLECTION = "api_keys"
 
+# Connection pool sizing shared by every scraper in the process
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", 50))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", 10))
+
+# Close pooled connections idle for longer than this (in milliseconds)
+MONGODB_MAX_IDLE_TIME_MS = 1000 * 60 * 5
+
+# Wire protocol compressors, in order of preference
+MONGODB_COMPRESSORS = os.getenv("MONGODB_COMPRESSORS", "zstd,zlib")
+
 # ==================== SCRAPER CONFIGURATION ====================
 
 # Scraper name - used to identify this scraper instance
 SCRAPER_NAME = os.getenv("SCRAPER_NAME", "bytez_api_keys_scraper")
 
 # Optional: Scraper ID to reuse an existing scraper
-# If not provided or scraper doesn't exist, a new one will be created
+# If not provided or scraper doesn't exist, the scraper named SCRAPER_NAME is
+# reused (and created on first run)
 SCRAPER_ID = os.getenv("SCRAPER_ID", None)
 
+# Log level: DEBUG shows every scraping step, INFO one summary per key
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 # ==================== TOR Configuration ====================
 
 USE_TOR = False  # Set to False to disable TOR
 TOR_PROXIES = {
     "server": "socks5://127.0.0.1:9150"
 }
+# SOCKS servers that new browser contexts are spread across, round-robin.
+# Tor never shares circuits between streams arriving on different SocksPorts,
+# so listing several ports (each needs its own "SocksPort" line in torrc)
+# gives contexts independent exit IPs without NEWNYM.
+# Comma-separated in the environment, e.g. "socks5://127.0.0.1:9150,socks5://127.0.0.1:9152"
+TOR_SOCKS_SERVERS = [
+    server.strip()
+    for server in os.getenv("TOR_SOCKS_SERVERS", TOR_PROXIES["server"]).split(",")
+    if server.strip()
+]
 TOR_CONTROL_PORT = 9151  # Default TOR control port
 TOR_RENEWAL_WAIT = 5  # Seconds to wait after renewing TOR IP
 
@@ -42,6 +67,12 @@ TOR_RENEWAL_WAIT = 5  # Seconds to wait after renewing TOR IP
 # Number of API keys to generate per run
 NUM_KEYS_TO_SCRAPE = 50
 
+# Number of accounts created in parallel, each in its own browser context
+CONCURRENCY = 3
+
+# Accounts a pooled browser context serves before it is closed and replaced
+CONTEXT_MAX_USES = 10
+
 # Run browser in headless mode (True = invisible, False = visible)
 HEADLESS_MODE = True
 
@@ -50,6 +81,14 @@ OUTPUT_DIR = BASE_DIR / "output"
 ACCOUNTS_FILE = OUTPUT_DIR / "accounts.json"
 ERROR_IMAGES_DIR = OUTPUT_DIR / "error_images"
 
+# Error screenshots kept in memory; they are written to disk only after the
+# same error has occurred ERROR_SCREENSHOT_THRESHOLD times
+ERROR_SCREENSHOT_BUFFER = 20
+ERROR_SCREENSHOT_THRESHOLD = 3
+ERROR_SCREENSHOT_WINDOW = 60 * 10  # Seconds before the same error's screenshots are saved again
+ERROR_SCREENSHOT_QUALITY = 40  # JPEG quality (0-100)
+SCREENSHOT_TIME_FORMAT = "%Y%m%d_%H%M%S"  # time.strftime format used in screenshot file names
+
 # Browser window size
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
@@ -67,19 +106,43 @@ API_URL = f"{BASE_URL}/api"
 # Timeout for waiting for elements to appear (in milliseconds)
 ELEMENT_TIMEOUT = 1000 * 60
 
+# Timeout for a navigation to be committed by the server (in milliseconds)
+NAVIGATION_TIMEOUT = 1000 * 20
+
 # Timeout for page redirects (in milliseconds)
 REDIRECT_TIMEOUT = 1000 * 15
 
+# Timeout for the API key to appear without reloading the page (in milliseconds)
+API_KEY_DISPLAY_TIMEOUT = 1000 * 5
+
 # Delay after dialog operations (in seconds)
 DIALOG_CLOSE_DELAY = 2
 
 # Delay between key generation attempts (in seconds)
 DELAY_BETWEEN_REQUESTS = 5
 
+# Number of API keys written to MongoDB per batch
+DB_BATCH_SIZE = 10
+
+# Maximum time an API key waits in the batch before being written (in seconds)
+DB_FLUSH_INTERVAL = 30
+
+# API keys locked for longer than this are released back to the pool (in seconds)
+STALE_LOCK_TIMEOUT = 3600
+
 # Pause duration when rate limit/error occurs (in seconds)
 # Default: 10 minutes = 600 seconds
 RATE_LIMIT_PAUSE_DURATION = 600
 
+# HTTP status codes that mean the site is rate limiting us; seeing one pauses every worker
+RATE_LIMIT_STATUS_CODES = frozenset({429})
+
+# Consecutive failures after which a worker treats errors as a rate limit
+MAX_CONSECUTIVE_ERRORS = 3
+
+# Delay before a worker retries after an isolated error (in seconds)
+TRANSIENT_ERROR_RETRY_DELAY = 5
+
 
 # ==================== CSS SELECTORS ====================
 # Update these if the website structure changes
@@ -88,19 +151,23 @@ SELECTORS = {
     # Authentication page
     "email_field": "input[type='email']",
     "password_field": "input[type='password']",
-    "signin_button": "body > div.MuiBox-root.mui-k008qs > div.MuiContainer-root.MuiContainer-maxWidthMedium.mui-115wm5w > div > div.MuiStack-root.mui-1i4rabj > span > button",
+    "signin_button": "div.mui-1i4rabj > span > button",
     
     # API page
-    "select_button": "body > div.MuiBox-root.mui-k008qs > div.MuiStack-root.mui-wmvkia > div.MuiStack-root.mui-1ytwwlm > div > div > div:nth-child(1) > span > button",
-    "api_key_display": "body > div.MuiBox-root.mui-k008qs > div.MuiStack-root.mui-wmvkia > div.MuiStack-root.mui-1ytwwlm > div.MuiContainer-root.MuiContainer-maxWidthExpanded.mui-1oaggd7 > div > div.MuiStack-root.mui-pg091t > div > div > div",
+    "select_button": "div.mui-1ytwwlm > div > div > div:nth-child(1) > span > button",
+    "api_key_display": "div.mui-1oaggd7 > div > div.mui-pg091t > div > div > div",
     
-    # Dialog elements
-    "radio_button": "body > div.MuiDialog-root.MuiModal-root.mui-ttaiqw > div.MuiDialog-container.MuiDialog-scrollPaper.mui-1dujj47 > div > div > div.MuiContainer-root.MuiContainer-maxWidthExpanded.mui-1oaggd7 > div > div.MuiStack-root.mui-1il9m9e > div:nth-child(1) > div > label:nth-child(1) > span.MuiButtonBase-root.MuiRadio-root.MuiRadio-colorPrimary.PrivateSwitchBase-root.MuiRadio-root.MuiRadio-colorPrimary.MuiRadio-root.MuiRadio-colorPrimary.mui-jy7gkk > input",
-    "checkbox": "body > div.MuiDialog-root.MuiModal-root.mui-ttaiqw > div.MuiDialog-container.MuiDialog-scrollPaper.mui-1dujj47 > div > div > div.MuiContainer-root.MuiContainer-maxWidthExpanded.mui-1oaggd7 > div > div.MuiStack-root.mui-1il9m9e > div:nth-child(2) > div > label:nth-child(1) > span.MuiButtonBase-root.MuiCheckbox-root.MuiCheckbox-colorPrimary.MuiCheckbox-sizeMedium.PrivateSwitchBase-root.MuiCheckbox-root.MuiCheckbox-colorPrimary.MuiCheckbox-sizeMedium.MuiCheckbox-root.MuiCheckbox-colorPrimary.MuiCheckbox-sizeMedium.mui-19w30dm > input",
-    "continue_button_1": "body > div.MuiDialog-root.MuiModal-root.mui-ttaiqw > div.MuiDialog-container.MuiDialog-scrollPaper.mui-1dujj47 > div > div > div.MuiContainer-root.MuiContainer-maxWidthExpanded.mui-1oaggd7 > div > button",
-    "continue_button_2": "body > div.MuiDialog-root.MuiModal-root.mui-ttaiqw > div.MuiDialog-container.MuiDialog-scrollPaper.mui-1dujj47 > div > div > div.MuiContainer-root.MuiContainer-maxWidthExpanded.mui-1i9y3xm > div.MuiStack-root.mui-12rj22n > button",
+    # Dialog elements (relative to dialog_root; inner containers repeat page classes)
+    "dialog_root": "div.MuiDialog-root",
+    "radio_button": "div.mui-1il9m9e > div:nth-child(1) > div > label:nth-child(1) input[type='radio']",
+    "checkbox": "div.mui-1il9m9e > div:nth-child(2) > div > label:nth-child(1) input[type='checkbox']",
+    "continue_button_1": "div.mui-1oaggd7 > div > button",
+    "continue_button_2": "div.mui-1i9y3xm > div.mui-12rj22n > button",
 }
 
+# Selectors resolved inside SELECTORS["dialog_root"] instead of the whole page
+DIALOG_SELECTORS = ("radio_button", "checkbox", "continue_button_1", "continue_button_2")
+
 
 # ==================== RANDOM GENERATION SETTINGS ====================
 
@@ -108,6 +175,9 @@ SELECTORS = {
 EMAIL_USERNAME_MIN_LENGTH = 8
 EMAIL_USERNAME_MAX_LENGTH = 12
 
+# Email username character set
+EMAIL_USERNAME_CHARACTERS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
 # Password length range
 PASSWORD_MIN_LENGTH = 12
 PASSWORD_MAX_LENGTH = 16
@@ -141,5 +211,9 @@ BROWSER_ARGS = [
     '--disable-gpu',
 ]
 
+# Request types aborted in every browser context; the scraper only reads the DOM
+# Set to an empty set to load pages in full
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+
 # User agent to mimic a real browser
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -2,7 +2,7 @@
 Core package for Bytez API Key Scraper
 """
 
-from .scraper import BytezAPIKeyScraper
-from .database import MongoDBManager
+from .scraper import BytezAPIKeyScraper, get_playwright, stop_playwright
+from .database import MongoDBManager, get_db_manager, close_db_manager
 
-__all__ = ['BytezAPIKeyScraper', 'MongoDBManager']
+__all__ = ['BytezAPIKeyScraper', 'MongoDBManager', 'get_db_manager', 'close_db_manager', 'get_playwright', 'stop_playwright']
@@ -0,0 +1,164 @@
+"""
+Browser context pool for Bytez API Key Scraper
+Reuses warm browser contexts across accounts instead of creating one per key
+"""
+
+import asyncio
+import itertools
+from typing import Collection, Dict, List
+from playwright.async_api import Browser, BrowserContext, Page, Route
+
+
+# Drops the site storage that context.clear_cookies() leaves behind
+CLEAR_STORAGE_SCRIPT = """
+async () => {
+    localStorage.clear();
+    sessionStorage.clear();
+    if (indexedDB.databases) {
+        for (const db of await indexedDB.databases()) {
+            indexedDB.deleteDatabase(db.name);
+        }
+    }
+}
+"""
+
+
+class ContextPool:
+    """
+    A fixed-size pool of browser contexts.
+
+    Contexts are reset between accounts and replaced after max_uses accounts
+    or after any error, so every signup still starts from a clean session.
+
+    Reuse is also how warm state carries over between accounts: a pooled
+    context keeps its connections and (when no request routing is installed)
+    its HTTP cache. A storage_state snapshot would not help here, since it only
+    holds cookies and localStorage, and seeding those would defeat the
+    per-signup isolation.
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        context_options: Dict,
+        size: int,
+        max_uses: int,
+        proxy_servers: List[str] = None,
+        blocked_resource_types: Collection[str] = ()
+    ):
+        """
+        Initialize the pool. Contexts are created lazily on acquire.
+
+        Args:
+            browser: Browser the contexts belong to
+            context_options: Keyword arguments for browser.new_context
+            size: Maximum number of contexts alive at once
+            max_uses: Accounts a context serves before it is replaced
+            proxy_servers: Optional proxy servers assigned to new contexts round-robin
+            blocked_resource_types: Request resource types aborted in every context
+        """
+        self.browser = browser
+        self.context_options = context_options
+        self.size = size
+        self.max_uses = max_uses
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._uses: Dict[BrowserContext, int] = {}
+        self._created = 0
+        self._proxy_servers = itertools.cycle(proxy_servers) if proxy_servers else None
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+
+    async def acquire(self) -> BrowserContext:
+        """
+        Get a ready context, creating one if the pool has room.
+
+        Returns:
+            A clean browser context
+        """
+        if self._ready.empty() and self._created < self.size:
+            self._created += 1
+            try:
+                context = await self.browser.new_context(**self._next_context_options())
+                if self.blocked_resource_types:
+                    await context.route("**/*", self._block_resources)
+            except BaseException:
+                self._created -= 1
+                raise
+            self._uses[context] = 0
+            return context
+        return await self._ready.get()
+
+    async def release(self, context: BrowserContext, healthy: bool = True):
+        """
+        Return a context to the pool, resetting or replacing it.
+
+        Args:
+            context: Context obtained from acquire
+            healthy: False if the account using it failed; the context is then replaced
+        """
+        self._uses[context] += 1
+        if healthy and self._uses[context] < self.max_uses:
+            try:
+                await self._reset(context)
+                self._ready.put_nowait(context)
+                return
+            except Exception:
+                pass
+        await self._discard(context)
+
+    @staticmethod
+    async def get_page(context: BrowserContext) -> Page:
+        """
+        Return the page kept open in a context, opening one if it has none.
+
+        Args:
+            context: Context obtained from acquire
+
+        Returns:
+            The context's page, parked on about:blank after a reset
+        """
+        for page in context.pages:
+            if not page.is_closed():
+                return page
+        return await context.new_page()
+
+    async def close(self):
+        """Close every idle context in the pool."""
+        while not self._ready.empty():
+            await self._discard(self._ready.get_nowait())
+
+    def _next_context_options(self) -> Dict:
+        """Context options for a new context, with the next proxy server if any."""
+        if self._proxy_servers is None:
+            return self.context_options
+        return {**self.context_options, 'proxy': {'server': next(self._proxy_servers)}}
+
+    async def _block_resources(self, route: Route):
+        """Abort requests for resource types the scraper never reads."""
+        if route.request.resource_type in self.blocked_resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _reset(self, context: BrowserContext):
+        """
+        Clear session state so the next account cannot see the previous one.
+        The first page is kept and parked on about:blank, which drops its JS
+        state without paying for a new page target on the next account.
+        """
+        pages = context.pages
+        if pages:
+            await pages[0].evaluate(CLEAR_STORAGE_SCRIPT)
+            for page in pages[1:]:
+                await page.close()
+            await pages[0].goto("about:blank")
+        await context.clear_cookies()
+        await context.clear_permissions()
+
+    async def _discard(self, context: BrowserContext):
+        """Close a context and free its slot."""
+        self._uses.pop(context, None)
+        self._created -= 1
+        try:
+            await context.close()
+        except Exception:
+            pass
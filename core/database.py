@@ -3,13 +3,50 @@ MongoDB Database Manager for Bytez API Key Scraper
 Handles all database operations for storing and retrieving API keys
 """
 
-from datetime import datetime
-from typing import Dict, List, Optional
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
 from bson import ObjectId
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, OperationFailure
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo import AsyncMongoClient, MongoClient, IndexModel, ReturnDocument
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import BulkWriteError, ConnectionFailure, OperationFailure
 from config import settings
 
+__all__ = ["MongoDBManager", "get_db_manager", "close_db_manager"]
+
+logger = logging.getLogger(__name__)
+
+
+# Fields returned by get_all_api_keys unless the caller asks for others
+DEFAULT_API_KEY_PROJECTION = {"email": 1, "password": 1, "api_key": 1}
+
+# Server error code for a duplicate key on a unique index
+DUPLICATE_KEY_ERROR = 11000
+
+# Immutable defaults shared by every new API key document
+BASE_DOC = {"in_use": False, "locked_at": None, "used_by": None}
+
+
+def _client_options(min_pool_size: int = None) -> Dict:
+    """
+    Connection options shared by the synchronous and asyncio MongoDB clients.
+
+    Args:
+        min_pool_size: Idle connections kept open (defaults to settings.MONGODB_MIN_POOL_SIZE)
+    """
+    return {
+        "serverSelectionTimeoutMS": 5000,  # 5 second timeout
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": min_pool_size if min_pool_size is not None else settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "retryWrites": True,
+        "w": 1,
+        "compressors": settings.MONGODB_COMPRESSORS,
+    }
+
 
 class MongoDBManager:
     """
@@ -25,7 +62,10 @@ class MongoDBManager:
         self.client = None
         self.db = None
         self.collection = None
+        self.raw_collection = None
         self.scrapers_collection = None
+        self.async_client = None
+        self.async_collection = None
         self.scraper_id = scraper_id
         self._connect()
 
@@ -37,19 +77,22 @@ class MongoDBManager:
             ConnectionFailure: If unable to connect to MongoDB
         """
         try:
-            self.client = MongoClient(
-                settings.MONGODB_URL,
-                serverSelectionTimeoutMS=5000  # 5 second timeout
-            )
+            # Key inserts go through the asyncio client, so only it keeps warm connections
+            self.client = MongoClient(settings.MONGODB_URL, **_client_options(min_pool_size=0))
             # Test the connection
             self.client.admin.command('ping')
             
             self.db = self.client[settings.MONGODB_DATABASE]
             self.collection = self.db[settings.MONGODB_COLLECTION]
+            # Same collection, but documents are only decoded field by field on access
+            self.raw_collection = self.collection.with_options(
+                codec_options=CodecOptions(document_class=RawBSONDocument)
+            )
             self.scrapers_collection = self.db["scrapers"]
+            self._ensure_indexes()
             
-            print(f"✓ Connected to MongoDB: {settings.MONGODB_DATABASE}")
-            print(f"  - Collections: scrapers, {settings.MONGODB_COLLECTION}")
+            logger.info(f"✓ Connected to MongoDB: {settings.MONGODB_DATABASE}")
+            logger.info(f"  - Collections: scrapers, {settings.MONGODB_COLLECTION}")
             
         except ConnectionFailure as e:
             raise ConnectionFailure(
@@ -58,9 +101,39 @@ class MongoDBManager:
         except Exception as e:
             raise Exception(f"Unexpected error connecting to MongoDB: {str(e)}")
 
+    def _ensure_indexes(self):
+        """
+        Create the indexes used by API key lookups. No-op when they already exist.
+        """
+        # Built apart from the unique indexes: a multi-index build is all-or-nothing
+        try:
+            self.collection.create_indexes([
+                IndexModel([("scraper_id", 1), ("in_use", 1)]),
+                IndexModel([("locked_at", 1)], partialFilterExpression={"in_use": True}),
+            ])
+        except OperationFailure as e:
+            logger.warning(f"⚠ Failed to create API key lookup indexes: {str(e)}")
+
+        try:
+            self.collection.create_indexes([
+                IndexModel([("email", 1)], unique=True),
+                IndexModel([("api_key", 1)], unique=True),
+            ])
+        except OperationFailure as e:
+            # Legacy duplicates block unique index builds; keep running without them
+            logger.warning(f"⚠ Failed to create API key unique indexes: {str(e)}")
+
+        try:
+            # Unique names stop concurrent upserts in get_or_create_scraper from racing
+            self.scrapers_collection.create_index([("name", 1)], unique=True)
+        except OperationFailure as e:
+            logger.warning(f"⚠ Failed to create scraper name index: {str(e)}")
+
     def get_or_create_scraper(self, scraper_name: str = None, scraper_id: str = None) -> ObjectId:
         """
         Get existing scraper or create a new one.
+        Scrapers without a valid scraper_id are matched by name, so concurrent
+        instances with the same name share a single scraper document.
         
         Args:
             scraper_name: Name for the scraper (defaults to settings.SCRAPER_NAME)
@@ -78,34 +151,40 @@ class MongoDBManager:
             
             # If scraper_id is provided, try to find it
             if scraper_id:
-                try:
-                    scraper = self.scrapers_collection.find_one({"_id": ObjectId(scraper_id)})
+                if ObjectId.is_valid(scraper_id):
+                    scraper = self.scrapers_collection.find_one({"_id": ObjectId(scraper_id)}, {"name": 1})
                     if scraper:
-                        print(f"✓ Using existing scraper: {scraper['name']} (ID: {scraper_id})")
-                        return ObjectId(scraper_id)
+                        logger.info(f"✓ Using existing scraper: {scraper['name']} (ID: {scraper_id})")
+                        return scraper["_id"]
                     else:
-                        print(f"⚠ Scraper ID {scraper_id} not found, creating new scraper...")
-                except Exception as e:
-                    print(f"⚠ Invalid scraper ID format: {scraper_id}, creating new scraper...")
-            
-            # Create new scraper
-            current_time = datetime.now()
-            scraper_doc = {
-                "name": scraper_name,
-                "created_at": current_time,
-                "updated_at": current_time
-            }
+                        logger.warning(f"⚠ Scraper ID {scraper_id} not found, using scraper named {scraper_name}...")
+                else:
+                    logger.warning(f"⚠ Invalid scraper ID format: {scraper_id}, using scraper named {scraper_name}...")
             
-            result = self.scrapers_collection.insert_one(scraper_doc)
-            print(f"✓ Created new scraper: {scraper_name} (ID: {result.inserted_id})")
-            return result.inserted_id
+            # Atomically fetch or create the scraper by name in one round-trip
+            current_time = datetime.now(timezone.utc)
+            scraper = self.scrapers_collection.find_one_and_update(
+                {"name": scraper_name},
+                {
+                    "$setOnInsert": {"created_at": current_time},
+                    "$set": {"updated_at": current_time}
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+                projection={"_id": 1},
+                # Older databases hold one document per restart; always pick the oldest
+                sort=[("created_at", 1)]
+            )
+            logger.info(f"✓ Using scraper: {scraper_name} (ID: {scraper['_id']})")
+            return scraper["_id"]
             
         except Exception as e:
             raise Exception(f"Failed to get or create scraper: {str(e)}")
 
     def save_api_key(self, account: Dict[str, str], scraper_id: ObjectId) -> bool:
         """
-        Save API key to MongoDB with the required schema.
+        Save a single API key to MongoDB with the required schema.
+        Thin wrapper around save_api_keys_bulk.
         
         Args:
             account: Dictionary containing email, password, and api_key
@@ -117,61 +196,216 @@ class MongoDBManager:
         Raises:
             Exception: If save operation fails
         """
+        return self.save_api_keys_bulk([account], scraper_id) == 1
+
+    def save_api_keys_bulk(self, accounts: List[Dict[str, str]], scraper_id: ObjectId) -> int:
+        """
+        Save several API keys to MongoDB in a single round-trip.
+        
+        Args:
+            accounts: List of dictionaries containing email, password, and api_key
+            scraper_id: ObjectId of the scraper that generated these keys
+            
+        Returns:
+            int: Number of documents inserted
+            
+        Raises:
+            Exception: If the insert fails or not every document was inserted
+        """
+        if not accounts:
+            return 0
+
         try:
-            # Get current timestamp
-            current_time = datetime.now()
+            documents = self._build_api_key_documents(accounts, scraper_id)
+            
+            # Unordered insert so a single bad document does not abort the batch
+            result = self.collection.insert_many(documents, ordered=False)
+            return self._check_inserted(result.inserted_ids, documents)
+                
+        except OperationFailure as e:
+            raise Exception(f"MongoDB operation failed: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Failed to save API keys to MongoDB: {str(e)}")
+
+    async def save_api_keys_bulk_async(self, accounts: List[Dict[str, str]], scraper_id: ObjectId) -> int:
+        """
+        Save several API keys without blocking the event loop.
+        Uses PyMongo's asyncio client, so no worker thread is involved.
+        
+        Args:
+            accounts: List of dictionaries containing email, password, and api_key
+            scraper_id: ObjectId of the scraper that generated these keys
             
-            # Prepare document with all required fields
-            document = {
+        Returns:
+            int: Number of documents inserted
+            
+        Raises:
+            BulkWriteError: If some documents were rejected; the others were inserted
+            Exception: If the insert fails or not every document was inserted
+        """
+        if not accounts:
+            return 0
+
+        try:
+            documents = self._build_api_key_documents(accounts, scraper_id)
+            
+            # Unordered insert so a single bad document does not abort the batch
+            result = await self._get_async_collection().insert_many(documents, ordered=False)
+            return self._check_inserted(result.inserted_ids, documents)
+                
+        except BulkWriteError:
+            # Callers need writeErrors to tell stored documents from failed ones
+            raise
+        except OperationFailure as e:
+            raise Exception(f"MongoDB operation failed: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Failed to save API keys to MongoDB: {str(e)}")
+
+    def _get_async_collection(self) -> AsyncCollection:
+        """
+        Return the API key collection on the asyncio client, creating it on first use.
+        The client belongs to the event loop it is first used from.
+        """
+        if self.async_collection is None:
+            self.async_client = AsyncMongoClient(settings.MONGODB_URL, **_client_options())
+            self.async_collection = self.async_client[settings.MONGODB_DATABASE][settings.MONGODB_COLLECTION]
+        return self.async_collection
+
+    @staticmethod
+    def _build_api_key_documents(accounts: List[Dict[str, str]], scraper_id: ObjectId) -> List[Dict]:
+        """Prepare API key documents with all required fields."""
+        # One UTC timestamp serves the whole batch
+        current_time = datetime.now(timezone.utc)
+        return [
+            {
+                **BASE_DOC,
                 "scraper_id": scraper_id,
                 "email": account.get("email"),
                 "password": account.get("password"),
                 "api_key": account.get("api_key"),
-                "in_use": False,
-                "locked_at": None,
-                "used_by": None,
                 "models_expirations": {},
                 "created_at": current_time,
                 "updated_at": current_time
             }
+            for account in accounts
+        ]
+
+    @staticmethod
+    def _check_inserted(inserted_ids: List[ObjectId], documents: List[Dict]) -> int:
+        """Verify every document was inserted and log the result."""
+        if len(inserted_ids) != len(documents):
+            raise Exception(f"Inserted {len(inserted_ids)} of {len(documents)} documents")
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for inserted_id in inserted_ids:
+                logger.debug(f"✓ API key saved to MongoDB with ID: {inserted_id}")
+        logger.info(f"✓ Saved {len(inserted_ids)} API key(s) to MongoDB")
+        return len(inserted_ids)
+
+    @staticmethod
+    def unsaved_document_indexes(error: BulkWriteError) -> List[int]:
+        """
+        Positions of the documents an unordered insert_many did not store.
+        Duplicate key errors count as stored: the document is already in MongoDB.
+
+        Args:
+            error: Error raised by insert_many(ordered=False)
+
+        Returns:
+            Indexes into the inserted document list
+        """
+        return [
+            write_error["index"]
+            for write_error in error.details.get("writeErrors", [])
+            if write_error.get("code") != DUPLICATE_KEY_ERROR
+        ]
+
+    def release_stale_locks(self, max_age: int = None) -> int:
+        """
+        Release API keys whose lock is older than max_age, server-side.
+        
+        Args:
+            max_age: Lock age in seconds (defaults to settings.STALE_LOCK_TIMEOUT)
             
-            # Insert document
-            result = self.collection.insert_one(document)
+        Returns:
+            int: Number of API keys released
+            
+        Raises:
+            Exception: If the update fails
+        """
+        max_age = max_age if max_age is not None else settings.STALE_LOCK_TIMEOUT
+        try:
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age)
+            result = self.collection.update_many(
+                {"in_use": True, "locked_at": {"$lt": cutoff}},
+                {"$set": {"in_use": False, "locked_at": None, "used_by": None}}
+            )
+            if result.modified_count:
+                logger.info(f"✓ Released {result.modified_count} stale API key lock(s)")
+            return result.modified_count
             
-            if result.inserted_id:
-                print(f"✓ API key saved to MongoDB with ID: {result.inserted_id}")
-                return True
-            else:
-                raise Exception("Failed to insert document - no ID returned")
-                
-        except OperationFailure as e:
-            raise Exception(f"MongoDB operation failed: {str(e)}")
         except Exception as e:
-            raise Exception(f"Failed to save API key to MongoDB: {str(e)}")
+            raise Exception(f"Failed to release stale API key locks: {str(e)}")
 
-    def get_all_api_keys(self) -> List[Dict]:
+    def get_all_api_keys(
+        self,
+        projection: Optional[Dict] = DEFAULT_API_KEY_PROJECTION,
+        batch_size: int = 100,
+        filter: Optional[Dict] = None,
+        raw: bool = False
+    ) -> Iterator[Dict]:
         """
-        Retrieve all API keys from MongoDB.
+        Stream API keys from MongoDB.
         
-        Returns:
-            List of API key documents
+        Args:
+            projection: Fields to return (defaults to email, password and api_key;
+                None returns whole documents)
+            batch_size: Number of documents fetched per server round-trip
+            filter: Optional query filter (defaults to all documents)
+            raw: Yield RawBSONDocument objects that decode fields lazily, so
+                timestamps and sub-documents the caller never reads are never
+                turned into Python objects
+            
+        Yields:
+            API key documents, one batch held in memory at a time
             
         Raises:
             Exception: If retrieval fails
         """
         try:
-            # Fetch all documents
-            documents = list(self.collection.find())
-            return documents
+            collection = self.raw_collection if raw else self.collection
+            yield from collection.find(filter or {}, projection, batch_size=batch_size)
             
         except Exception as e:
             raise Exception(f"Failed to retrieve API keys from MongoDB: {str(e)}")
 
+    def get_all_api_keys_list(self, **kwargs) -> List[Dict]:
+        """
+        Retrieve API keys from MongoDB as a list.
+        Kept for legacy callers, so whole documents are returned unless a
+        projection is passed.
+        
+        Args:
+            **kwargs: Passed through to get_all_api_keys
+            
+        Returns:
+            List of API key documents
+        """
+        kwargs.setdefault("projection", None)
+        return list(self.get_all_api_keys(**kwargs))
+
     def close(self):
         """Close MongoDB connection."""
         if self.client:
             self.client.close()
-            print("✓ MongoDB connection closed")
+            logger.info("✓ MongoDB connection closed")
+
+    async def aclose(self):
+        """Close the asyncio MongoDB client, if it was ever created."""
+        if self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
+            self.async_collection = None
 
     def __enter__(self):
         """Context manager entry."""
@@ -180,3 +414,35 @@ class MongoDBManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         self.close()
+
+
+_db_manager: Optional[MongoDBManager] = None
+_db_manager_lock = threading.Lock()
+
+
+def get_db_manager() -> MongoDBManager:
+    """
+    Return the process-wide MongoDBManager, connecting on first use.
+    
+    All scrapers in the process share this instance so they draw from a
+    single pooled MongoClient instead of opening one each.
+    
+    Returns:
+        MongoDBManager: The shared manager
+    """
+    global _db_manager
+    if _db_manager is None:
+        with _db_manager_lock:
+            if _db_manager is None:
+                _db_manager = MongoDBManager()
+    return _db_manager
+
+
+async def close_db_manager():
+    """Close both clients of the process-wide MongoDBManager, if it was created."""
+    global _db_manager
+    with _db_manager_lock:
+        db_manager, _db_manager = _db_manager, None
+    if db_manager is not None:
+        await db_manager.aclose()
+        db_manager.close()
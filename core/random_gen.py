@@ -0,0 +1,49 @@
+"""
+Random string generation for Bytez API Key Scraper
+Maps cryptographically secure random bytes onto a character set in bulk
+"""
+
+import secrets
+from functools import lru_cache
+from typing import Tuple
+
+
+@lru_cache(maxsize=None)
+def _translation_tables(alphabet: str) -> Tuple[bytes, bytes]:
+    """
+    Build the bytes.translate tables for an alphabet.
+
+    Bytes at or above the largest multiple of len(alphabet) are deleted rather
+    than mapped, so every character stays equally likely.
+
+    Args:
+        alphabet: ASCII characters to draw from (at most 256)
+
+    Returns:
+        Tuple of (256-entry translation table, bytes to delete)
+    """
+    encoded = alphabet.encode("ascii")
+    size = len(encoded)
+    limit = 256 - (256 % size)
+    table = bytes(encoded[i % size] for i in range(256))
+    delete = bytes(range(limit, 256))
+    return table, delete
+
+
+def random_string(alphabet: str, length: int) -> str:
+    """
+    Generate a random string using the secrets module.
+
+    Args:
+        alphabet: ASCII characters to draw from (at most 256)
+        length: Number of characters to generate
+
+    Returns:
+        Random string of the requested length
+    """
+    table, delete = _translation_tables(alphabet)
+    result = b""
+    while len(result) < length:
+        # Over-draw so rejected bytes rarely force a second round
+        result += secrets.token_bytes(length * 2).translate(table, delete)
+    return result[:length].decode("ascii")
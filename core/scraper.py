@@ -1,34 +1,122 @@
 import asyncio
+import itertools
 import json
+import logging
 import random
-import string
 import sys
-from datetime import datetime
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List
-from playwright.async_api import async_playwright, Page, Browser
+from types import SimpleNamespace
+from collections import Counter, deque
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+from playwright.async_api import async_playwright, Page, Browser, Locator, Playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from pymongo.errors import BulkWriteError
 from stem import Signal
 from stem.control import Controller
 
 # Import configuration
 from config import settings
-from core.database import MongoDBManager
+from core.context_pool import ContextPool
+from core.database import get_db_manager
+from core.random_gen import random_string
+
+logger = logging.getLogger(__name__)
+
+# Process-wide Playwright driver, bound to the event loop that started it
+_playwright: Optional[Playwright] = None
+_playwright_loop: Optional[asyncio.AbstractEventLoop] = None
+_playwright_lock: Optional[asyncio.Lock] = None
+
+
+async def get_playwright() -> Playwright:
+    """
+    Return the shared Playwright instance, starting its driver on first use.
+    Scrapers on the same event loop share one node driver process.
+    """
+    global _playwright, _playwright_loop, _playwright_lock
+    loop = asyncio.get_running_loop()
+    if _playwright_loop is not loop:
+        # An instance started on a previous (now closed) loop cannot be reused
+        _playwright, _playwright_loop, _playwright_lock = None, loop, asyncio.Lock()
+    async with _playwright_lock:
+        if _playwright is None:
+            _playwright = await async_playwright().start()
+    return _playwright
+
+
+async def stop_playwright():
+    """Stop the shared Playwright driver if it was started."""
+    global _playwright
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
+
+
+# Process-wide Tor control connection, opened on first renewal and kept open
+_tor_controller: Optional[Controller] = None
+_tor_controller_lock = threading.Lock()
+
+
+def _get_tor_controller() -> Controller:
+    """
+    Return the shared Tor controller, (re)connecting if the socket has dropped.
+    Must be called with _tor_controller_lock held.
+    """
+    global _tor_controller
+    if _tor_controller is None or not _tor_controller.is_alive():
+        controller = Controller.from_port(port=settings.TOR_CONTROL_PORT)
+        controller.authenticate()  # If needed, provide your control password here
+        _tor_controller = controller
+    return _tor_controller
 
 
 def renew_tor_ip(logger=None):
     """Renew TOR IP address by requesting a new circuit."""
-    logger = logger if logger else print
-    try:
-        with Controller.from_port(port=settings.TOR_CONTROL_PORT) as controller:
-            controller.authenticate()  # If needed, provide your control password here
-            controller.signal(Signal.NEWNYM)
-            logger("-> Tor IP renewed.")
-            return True
-    except Exception as e:
-        logger(f"-> Failed to renew Tor IP: {str(e)}")
+    global _tor_controller
+    logger = logger if logger else logging.getLogger(__name__).info
+    with _tor_controller_lock:
+        error = None
+        # A stale connection gets one reconnect before giving up
+        for _ in range(2):
+            try:
+                _get_tor_controller().signal(Signal.NEWNYM)
+                logger("-> Tor IP renewed.")
+                return True
+            except Exception as e:
+                error = e
+                if _tor_controller is not None:
+                    _tor_controller.close()
+                    _tor_controller = None
+        logger(f"-> Failed to renew Tor IP: {str(error)}")
         return False
 
 
+def compiled_selectors(page: Page, selectors: Dict[str, str] = None) -> SimpleNamespace:
+    """
+    Build a Locator for every configured selector once per page.
+    Dialog selectors are chained off a single dialog root locator so their
+    DOM walk starts at the dialog rather than at the document body. Every
+    locator targets its first match, like the page-level calls it replaced,
+    so a selector matching more than one element does not fail strict mode.
+
+    Args:
+        page: Playwright page object
+        selectors: Mapping of names to CSS selectors (defaults to settings.SELECTORS)
+
+    Returns:
+        Namespace with one Locator attribute per selector name
+    """
+    selectors = selectors if selectors is not None else settings.SELECTORS
+    dialog_root = page.locator(selectors["dialog_root"])
+    locators = {}
+    for name, selector in selectors.items():
+        parent = dialog_root if name in settings.DIALOG_SELECTORS else page
+        locators[name] = parent.locator(selector).first
+    return SimpleNamespace(**locators)
+
+
 class BytezAPIKeyScraper:
     """
     A scraper class to automate the process of creating accounts and
@@ -51,17 +139,34 @@ class BytezAPIKeyScraper:
         self.selectors = settings.SELECTORS
         self.error_images_dir = Path(settings.ERROR_IMAGES_DIR)
         self.use_tor = settings.USE_TOR
+        self.attempts = 0
+
+        # API keys waiting to be written to MongoDB in one batch
+        self._pending: List[Dict[str, str]] = []
+        self._pending_lock = asyncio.Lock()
+        self._last_flush = time.monotonic()
+
+        # Recent error screenshots, written to disk only once their error recurs
+        self._error_screenshots: Deque[Tuple[str, str, bytes]] = deque(maxlen=settings.ERROR_SCREENSHOT_BUFFER)
+        self._error_counts: Counter = Counter()
+        self._error_saved_at: Dict[str, float] = {}
+
+        # Set while workers may start accounts; cleared during a rate-limit recovery
+        self._rate_limit_clear = asyncio.Event()
+        self._rate_limit_clear.set()
+        self._recovery_task: Optional[asyncio.Task] = None
         
         # Initialize MongoDB manager
         try:
-            self.db_manager = MongoDBManager()
+            self.db_manager = get_db_manager()
             # Initialize scraper and get scraper_id
             self.scraper_id = self.db_manager.get_or_create_scraper()
+            self.db_manager.release_stale_locks()
         except Exception as e:
-            print(f"\n{'=' * 60}")
-            print(f"CRITICAL ERROR: Failed to connect to MongoDB or initialize scraper")
-            print(f"Error: {str(e)}")
-            print(f"{'=' * 60}")
+            logger.error(f"\n{'=' * 60}")
+            logger.error(f"CRITICAL ERROR: Failed to connect to MongoDB or initialize scraper")
+            logger.error(f"Error: {str(e)}")
+            logger.error(f"{'=' * 60}")
             raise
         
         # Ensure output directories exist
@@ -72,14 +177,41 @@ class BytezAPIKeyScraper:
     def generate_random_email() -> str:
         """Generate a random email address."""
         username_length = random.randint(settings.EMAIL_USERNAME_MIN_LENGTH, settings.EMAIL_USERNAME_MAX_LENGTH)
-        username = ''.join(random.choices(string.ascii_lowercase + string.digits, k=username_length))
+        username = random_string(settings.EMAIL_USERNAME_CHARACTERS, username_length)
         return f"{username}@gmail.com"
 
     @staticmethod
     def generate_random_password() -> str:
         """Generate a random password."""
         length = random.randint(settings.PASSWORD_MIN_LENGTH, settings.PASSWORD_MAX_LENGTH)
-        return ''.join(random.choices(settings.PASSWORD_CHARACTERS, k=length))
+        return random_string(settings.PASSWORD_CHARACTERS, length)
+
+    @staticmethod
+    async def goto_and_wait(page: Page, url: str, locator: Locator, timeout: int = None, state: str = "attached"):
+        """
+        Navigate to a URL and wait for an element concurrently.
+        The navigation only waits for the response to commit; the element
+        wait is what gates the next step.
+
+        Args:
+            page: Playwright page object
+            url: URL to navigate to
+            locator: Element expected on the new page
+            timeout: Element timeout in milliseconds (defaults to settings.ELEMENT_TIMEOUT)
+            state: Element state to wait for; "attached" suffices before an auto-waiting
+                click or fill, reads such as text_content need "visible"
+        """
+        timeout = timeout if timeout is not None else settings.ELEMENT_TIMEOUT
+        tasks = [
+            asyncio.ensure_future(page.goto(url, wait_until="commit", timeout=settings.NAVIGATION_TIMEOUT)),
+            asyncio.ensure_future(locator.wait_for(state=state, timeout=timeout)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # If either side failed, stop waiting on the other
+            for task in tasks:
+                task.cancel()
 
     async def create_account_and_get_key(self, page: Page) -> Dict[str, str]:
         """
@@ -91,107 +223,97 @@ class BytezAPIKeyScraper:
         Returns:
             Dictionary containing email, password, and api_key
         """
+        # Resolve per-call constants once instead of on every step
+        locators = compiled_selectors(page, self.selectors)
+        auth_url, api_url, base_url = self.auth_url, self.api_url, self.base_url
+        element_timeout = settings.ELEMENT_TIMEOUT
         email = self.generate_random_email()
         password = self.generate_random_password()
 
-        print(f"Creating account with email: {email}")
-        print(f"Password: {password}")
+        logger.info(f"Creating account with email: {email}")
+        logger.debug("Password: %s", password)
 
-        # Navigate to auth page
-        print(f"\n[1/10] Navigating to auth page: {self.auth_url}")
-        await page.goto(self.auth_url, wait_until="domcontentloaded")
-        current_url = page.url
-        print(f"       Current URL: {current_url}")
-        
-        print(f"[2/10] Waiting for email field selector: {self.selectors['email_field']}")
-        await page.wait_for_selector(self.selectors["email_field"], timeout=settings.ELEMENT_TIMEOUT)
-        print(f"       ✓ Email field found")
-
-        # Fill in email and password using Playwright methods
-        print(f"[3/10] Filling email field")
-        await page.fill(self.selectors["email_field"], email)
-        print(f"       ✓ Email filled: {email}")
+        # Navigate to auth page while already waiting for the email field
+        logger.debug("\n[1/10] Navigating to auth page: %s", auth_url)
+        logger.debug("[2/10] Waiting for email field selector: %s", self.selectors['email_field'])
+        await self.goto_and_wait(page, auth_url, locators.email_field)
+        logger.debug("       Current URL: %s", page.url)
+        logger.debug("       ✓ Email field found")
+
+        # Fill in email and password; fill waits for each field to be editable itself
+        logger.debug("[3/10] Filling email field")
+        await locators.email_field.fill(email, timeout=element_timeout)
+        logger.debug("       ✓ Email filled: %s", email)
         
-        print(f"[4/10] Filling password field")
-        await page.fill(self.selectors["password_field"], password)
-        print(f"       ✓ Password filled")
+        logger.debug("[4/10] Filling password field")
+        await locators.password_field.fill(password, timeout=element_timeout)
+        logger.debug("       ✓ Password filled")
 
-        # Click sign in button
-        print(f"[5/10] Clicking sign up button")
-        await page.click(self.selectors["signin_button"])
-        print(f"       ✓ Button clicked")
+        # Click sign in button; the redirect wait below covers the navigation it starts
+        logger.debug("[5/10] Clicking sign up button")
+        await locators.signin_button.click(no_wait_after=True)
+        logger.debug("       ✓ Button clicked")
 
         # Wait for redirect to dashboard
-        print(f"[6/10] Waiting for redirect to dashboard...")
-        await page.wait_for_url(self.base_url + "/", timeout=settings.REDIRECT_TIMEOUT)
-        current_url = page.url
-        print(f"       ✓ Redirected to: {current_url}")
-
-        # Navigate to API page
-        print(f"[7/10] Navigating to API page: {self.api_url}")
-        await page.goto(self.api_url, wait_until="domcontentloaded")
-        current_url = page.url
-        print(f"       Current URL: {current_url}")
-        
-        print(f"[7/10] Waiting for select button")
-        await page.wait_for_selector(self.selectors["select_button"], timeout=settings.ELEMENT_TIMEOUT)
-        print(f"       ✓ Select button found")
+        logger.debug("[6/10] Waiting for redirect to dashboard...")
+        await page.wait_for_url(base_url + "/", wait_until="commit", timeout=settings.REDIRECT_TIMEOUT)
+        logger.debug("       ✓ Redirected to: %s", page.url)
 
-        # Click "Select" button
-        print(f"[8/10] Clicking select button")
-        await page.click(self.selectors["select_button"])
-        print(f"       ✓ Select button clicked")
+        # Navigate to API page while already waiting for the select button
+        logger.debug("[7/10] Navigating to API page: %s", api_url)
+        logger.debug("[7/10] Waiting for select button")
+        await self.goto_and_wait(page, api_url, locators.select_button)
+        logger.debug("       Current URL: %s", page.url)
+        logger.debug("       ✓ Select button found")
 
-        # Wait for dialog to appear
-        print(f"[8/10] Waiting for radio button in dialog")
-        await page.wait_for_selector(self.selectors["radio_button"], timeout=settings.ELEMENT_TIMEOUT)
-        print(f"       ✓ Dialog appeared with radio button")
+        # Click "Select" button
+        logger.debug("[8/10] Clicking select button")
+        await locators.select_button.click()
+        logger.debug("       ✓ Select button clicked")
 
-        # Click radio button
-        print(f"[8/10] Clicking radio button")
-        await page.click(self.selectors["radio_button"])
-        print(f"       ✓ Radio button clicked")
+        # Click radio button; the click itself waits for the dialog to appear
+        logger.debug("[8/10] Waiting for dialog and clicking radio button")
+        await locators.radio_button.click(timeout=element_timeout)
+        logger.debug("       ✓ Radio button clicked")
 
         # Click checkbox
-        print(f"[8/10] Clicking checkbox")
-        await page.click(self.selectors["checkbox"])
-        print(f"       ✓ Checkbox clicked")
+        logger.debug("[8/10] Clicking checkbox")
+        await locators.checkbox.click()
+        logger.debug("       ✓ Checkbox clicked")
 
         # Click first continue button
-        print(f"[9/10] Clicking first continue button")
-        await page.click(self.selectors["continue_button_1"])
-        print(f"       ✓ First continue clicked")
-
-        # Wait for second continue button to appear
-        print(f"[9/10] Waiting for second continue button")
-        await page.wait_for_selector(self.selectors["continue_button_2"], timeout=settings.ELEMENT_TIMEOUT)
-        print(f"       ✓ Second continue button appeared")
+        logger.debug("[9/10] Clicking first continue button")
+        await locators.continue_button_1.click()
+        logger.debug("       ✓ First continue clicked")
 
-        # Click second continue button
-        print(f"[9/10] Clicking second continue button")
-        await page.click(self.selectors["continue_button_2"])
-        print(f"       ✓ Second continue clicked")
+        # Click second continue button once it appears
+        logger.debug("[9/10] Waiting for and clicking second continue button")
+        await locators.continue_button_2.click(timeout=element_timeout)
+        logger.debug("       ✓ Second continue clicked")
 
         # Wait for dialog to close and page to update
-        print(f"[9/10] Waiting for dialog to close...")
+        logger.debug("[9/10] Waiting for dialog to close...")
         await asyncio.sleep(settings.DIALOG_CLOSE_DELAY)
-        print(f"       ✓ Dialog closed")
+        logger.debug("       ✓ Dialog closed")
 
-        # Navigate back to API page to ensure key is displayed
-        print(f"[10/10] Navigating back to API page")
-        await page.goto(self.api_url, wait_until="domcontentloaded")
-        current_url = page.url
-        print(f"        Current URL: {current_url}")
-        
-        print(f"[10/10] Waiting for API key display element")
-        await page.wait_for_selector(self.selectors["api_key_display"], timeout=settings.ELEMENT_TIMEOUT)
-        print(f"        ✓ API key element found")
+        # The page usually re-renders with the key in place; only navigate if it does not
+        logger.debug("[10/10] Waiting for API key display element")
+        try:
+            await locators.api_key_display.wait_for(timeout=settings.API_KEY_DISPLAY_TIMEOUT)
+        except PlaywrightTimeoutError:
+            logger.debug("[10/10] Key not shown in place, navigating back to API page")
+            await self.goto_and_wait(page, api_url, locators.api_key_display, state="visible")
+        logger.debug("        Current URL: %s", page.url)
+        logger.debug("        ✓ API key element found")
 
         # Extract API key using text_content
-        print(f"[10/10] Extracting API key text")
-        api_key = await page.text_content(self.selectors["api_key_display"])
+        logger.debug("[10/10] Extracting API key text")
+        api_key = await locators.api_key_display.text_content()
+        if not api_key or not api_key.strip():
+            # Fail this account rather than queue a blank key for the unique index
+            raise Exception("API key element was empty")
 
-        print(f"Successfully generated API key: {api_key[:20]}...")
+        logger.info(f"Successfully generated API key: {api_key[:20]}...")
 
         return {
             "email": email,
@@ -199,177 +321,405 @@ class BytezAPIKeyScraper:
             "api_key": api_key
         }
 
-    def save_api_key_to_db(self, account: Dict[str, str]):
+    async def save_api_key_to_db(self, account: Dict[str, str]):
         """
-        Save API key to MongoDB.
-        CRITICAL: If save fails, raises exception to stop the scraper.
+        Queue an API key for saving to MongoDB.
+        The queue is flushed once it holds settings.DB_BATCH_SIZE keys or
+        settings.DB_FLUSH_INTERVAL seconds have passed since the last flush.
 
         Args:
             account: Dictionary containing email, password, and api_key
             
         Raises:
+            Exception: If a triggered flush fails
+        """
+        self._pending.append(account)
+        elapsed = time.monotonic() - self._last_flush
+        if len(self._pending) >= settings.DB_BATCH_SIZE or elapsed >= settings.DB_FLUSH_INTERVAL:
+            await self.flush_api_keys()
+
+    async def flush_api_keys(self):
+        """
+        Save all queued API keys to MongoDB in one batch.
+        CRITICAL: If save fails, raises exception to stop the scraper.
+        Keys that were not stored stay queued; keys MongoDB already holds are dropped.
+            
+        Raises:
+            BulkWriteError: If MongoDB rejected some of the keys
             Exception: If MongoDB save operation fails
         """
-        try:
-            success = self.db_manager.save_api_key(account, self.scraper_id)
-            if not success:
-                raise Exception("MongoDB save operation returned False")
-        except Exception as e:
-            print(f"\n{'=' * 60}")
-            print(f"CRITICAL ERROR: Failed to save API key to MongoDB")
-            print(f"Error: {str(e)}")
-            print(f"Stopping scraper to prevent data loss...")
-            print(f"{'=' * 60}")
-            raise
+        async with self._pending_lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            try:
+                inserted = await self.db_manager.save_api_keys_bulk_async(batch, self.scraper_id)
+                if inserted != len(batch):
+                    raise Exception(f"MongoDB save operation inserted {inserted} of {len(batch)} API keys")
+            except BulkWriteError as e:
+                # Part of the batch was stored; only keep the documents that were rejected
+                unsaved = [batch[index] for index in self.db_manager.unsaved_document_indexes(e)]
+                if not unsaved:
+                    logger.warning(f"⚠ Saved API key batch; some keys were already in MongoDB")
+                    return
+                self._pending[:0] = unsaved
+                self._log_save_failure(unsaved, e)
+                raise
+            except BaseException as e:
+                # Keep the batch queued so the final flush (or the accounts file) still has it.
+                # BaseException: a shutdown cancelling the insert must not drop the batch either.
+                self._pending[:0] = batch
+                if isinstance(e, Exception):
+                    self._log_save_failure(batch, e)
+                raise
+
+    @staticmethod
+    def _log_save_failure(accounts: List[Dict[str, str]], error: Exception):
+        """Log a failed MongoDB save before the scraper stops."""
+        logger.error(f"\n{'=' * 60}")
+        logger.error(f"CRITICAL ERROR: Failed to save {len(accounts)} API key(s) to MongoDB")
+        logger.error(f"Error: {str(error)}")
+        logger.error(f"Stopping scraper to prevent data loss...")
+        logger.error(f"{'=' * 60}")
+
+    async def dump_pending_accounts(self):
+        """
+        Append API keys that could not be saved to MongoDB to the accounts file,
+        so a database outage does not lose accounts that were already created.
+        """
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+
+        def write():
+            accounts = []
+            if self.accounts_file.exists():
+                accounts = json.loads(self.accounts_file.read_text(encoding="utf-8") or "[]")
+            accounts.extend(batch)
+            self.accounts_file.write_text(json.dumps(accounts, indent=2), encoding="utf-8")
+
+        await asyncio.to_thread(write)
+        logger.error(f"Saved {len(batch)} unsaved API key(s) to {self.accounts_file}")
+
+    async def _flusher(self):
+        """Flush queued API keys every settings.DB_FLUSH_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(settings.DB_FLUSH_INTERVAL)
+            await self.flush_api_keys()
+
+    async def record_error_screenshot(self, signature: str, filename: str, screenshot: bytes):
+        """
+        Buffer an error screenshot, persisting it once its error keeps recurring.
+
+        Args:
+            signature: Error type and first message line, used to spot repeats
+            filename: File name to use if the screenshot is written to disk
+            screenshot: Encoded image bytes
+        """
+        self._error_counts[signature] += 1
+        self._error_screenshots.append((signature, filename, screenshot))
+        count = self._error_counts[signature]
+        if len(self._error_counts) > settings.ERROR_SCREENSHOT_BUFFER:
+            # Forget errors whose screenshots have all been evicted from the buffer
+            buffered = {item[0] for item in self._error_screenshots}
+            for stale in [sig for sig in self._error_counts if sig not in buffered]:
+                del self._error_counts[stale]
+
+        # An error's screenshots are saved at most once per ERROR_SCREENSHOT_WINDOW,
+        # so a storm of the same error does not fill the directory again
+        now = time.monotonic()
+        for saved, saved_at in list(self._error_saved_at.items()):
+            if now - saved_at >= settings.ERROR_SCREENSHOT_WINDOW:
+                del self._error_saved_at[saved]
+        if count < settings.ERROR_SCREENSHOT_THRESHOLD or signature in self._error_saved_at:
+            logger.info(f"Screenshot buffered in memory (error seen {count} time(s))")
+            return
+
+        # Recurring error: write out every buffered screenshot of it
+        self._error_saved_at[signature] = now
+        del self._error_counts[signature]
+        matching = [item for item in self._error_screenshots if item[0] == signature]
+        others = [item for item in self._error_screenshots if item[0] != signature]
+        self._error_screenshots.clear()
+        self._error_screenshots.extend(others)
+        await self.save_error_screenshots(matching)
+
+    async def save_error_screenshots(self, screenshots: List[Tuple[str, str, bytes]] = None):
+        """
+        Write buffered error screenshots to the error images directory.
+
+        Args:
+            screenshots: (signature, filename, bytes) entries (defaults to the whole buffer)
+        """
+        if screenshots is None:
+            screenshots = list(self._error_screenshots)
+            self._error_screenshots.clear()
+
+        def write():
+            for _, filename, screenshot in screenshots:
+                (self.error_images_dir / filename).write_bytes(screenshot)
+
+        if screenshots:
+            await asyncio.to_thread(write)
+            for _, filename, _ in screenshots:
+                logger.info(f"Screenshot saved: {self.error_images_dir / filename}")
 
     async def display_countdown(self, seconds: int):
         """
-        Display a countdown timer in HH:MM:SS format.
+        Pause for the given time, showing a countdown timer in HH:MM:SS
+        format when stdout is a terminal.
         
         Args:
             seconds: Number of seconds to count down
         """
-        print(f"\nPausing for {seconds} seconds due to error/rate limit...")
+        logger.info(f"\nPausing for {seconds} seconds due to error/rate limit...")
+        if not sys.stdout.isatty():
+            # Nobody watches a live timer in piped logs (e.g. the web service)
+            await asyncio.sleep(seconds)
+            logger.info("Resuming scraping...")
+            return
+
+        # Redraw the timer from loop callbacks while a single sleep does the waiting
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + seconds
+        handle = None
+
+        def tick():
+            nonlocal handle
+            remaining = max(0, round(deadline - loop.time()))
+            m, s = divmod(remaining, 60)
+            h, m = divmod(m, 60)
+            time_str = "{:02d}:{:02d}:{:02d}".format(h, m, s)
+            print(f"\rResuming in: {time_str}", end="", flush=True)
+            handle = loop.call_later(1, tick)
+
+        tick()
         try:
-            for remaining in range(seconds, 0, -1):
-                m, s = divmod(remaining, 60)
-                h, m = divmod(m, 60)
-                time_str = "{:02d}:{:02d}:{:02d}".format(h, m, s)
-                print(f"\rResuming in: {time_str}", end="", flush=True)
-                await asyncio.sleep(1)
-            print("\rResuming scraping...                    ")  # Clear the line
-        except asyncio.CancelledError:
-            raise
+            await asyncio.sleep(seconds)
+        finally:
+            handle.cancel()
+        print("\rResuming scraping...                    ")  # Clear the line
 
     async def handle_error_recovery(self):
         """
         Handle error recovery - either renew TOR IP or use countdown timer.
         """
         if self.use_tor:
-            print("\n" + "=" * 50)
-            print("Renewing TOR IP address...")
-            print("=" * 50)
+            logger.info("\n" + "=" * 50)
+            logger.info("Renewing TOR IP address...")
+            logger.info("=" * 50)
             
-            if renew_tor_ip(print):
+            # Control-port I/O blocks, so it runs off the event loop
+            if await asyncio.to_thread(renew_tor_ip, logger.info):
                 # Wait a bit for the new circuit to establish
-                print("Waiting for new TOR circuit to establish...")
+                logger.info("Waiting for new TOR circuit to establish...")
                 await asyncio.sleep(settings.TOR_RENEWAL_WAIT)
-                print("Ready to continue.")
+                logger.info("Ready to continue.")
             else:
-                print("Failed to renew TOR IP, falling back to countdown...")
+                logger.warning("Failed to renew TOR IP, falling back to countdown...")
                 await self.display_countdown(settings.RATE_LIMIT_PAUSE_DURATION)
         else:
             # Use countdown timer if TOR is not enabled
             await self.display_countdown(settings.RATE_LIMIT_PAUSE_DURATION)
 
+    def start_rate_limit_recovery(self):
+        """
+        Pause every worker and run error recovery once.
+        Calls made while a recovery is already running are ignored.
+        """
+        if not self._rate_limit_clear.is_set():
+            return
+        self._rate_limit_clear.clear()
+        self._recovery_task = asyncio.create_task(self._recover())
+
+    async def _recover(self):
+        """Run error recovery, then let the workers resume."""
+        try:
+            await self.handle_error_recovery()
+        finally:
+            self._rate_limit_clear.set()
+
     async def scrape_keys(self):
         """
         Scrape API keys indefinitely until stopped by user (Ctrl+C).
         """
-        async with async_playwright() as p:
-            # Select browser based on settings
-            browser_type = settings.BROWSER_TYPE.lower()
-            if browser_type == 'firefox':
-                browser_launcher = p.firefox
-            elif browser_type == 'webkit':
-                browser_launcher = p.webkit
-            else:  # default to chromium
-                browser_launcher = p.chromium
-            
-            # Prepare launch options
-            launch_options = {
-                'headless': self.headless,
-                'args': settings.BROWSER_ARGS
-            }
-            
-            # Add custom executable path if specified
-            if settings.BROWSER_EXECUTABLE_PATH:
-                launch_options['executable_path'] = settings.BROWSER_EXECUTABLE_PATH
-            
-            # Add TOR proxy if enabled
-            if self.use_tor:
-                launch_options['proxy'] = settings.TOR_PROXIES
-                print(f"\n{'=' * 50}")
-                print(f"TOR Proxy enabled: {settings.TOR_PROXIES['server']}")
-                print(f"{'=' * 50}")
-            
-            browser: Browser = await browser_launcher.launch(**launch_options)
+        # Shared driver: one node process no matter how many scrapers run
+        p = await get_playwright()
+
+        # Select browser based on settings
+        browser_type = settings.BROWSER_TYPE.lower()
+        if browser_type == 'firefox':
+            browser_launcher = p.firefox
+        elif browser_type == 'webkit':
+            browser_launcher = p.webkit
+        else:  # default to chromium
+            browser_launcher = p.chromium
+        
+        # Prepare launch options
+        launch_options = {
+            'headless': self.headless,
+            'args': settings.BROWSER_ARGS
+        }
+        
+        # Add custom executable path if specified
+        if settings.BROWSER_EXECUTABLE_PATH:
+            launch_options['executable_path'] = settings.BROWSER_EXECUTABLE_PATH
+        
+        # Add TOR proxy if enabled
+        if self.use_tor:
+            launch_options['proxy'] = settings.TOR_PROXIES
+            logger.info(f"\n{'=' * 50}")
+            logger.info(f"TOR Proxy enabled: {settings.TOR_PROXIES['server']}")
+            logger.info(f"{'=' * 50}")
+            if settings.CONCURRENCY > 1 and len(settings.TOR_SOCKS_SERVERS) < 2:
+                logger.warning(
+                    f"⚠ {settings.CONCURRENCY} workers share one Tor SOCKS port and therefore one circuit; "
+                    f"set TOR_SOCKS_SERVERS to several ports for per-worker exit IPs"
+                )
+        
+        browser: Browser = await browser_launcher.launch(**launch_options)
 
-            print(f"\n{'=' * 50}")
-            print(f"Starting infinite scraping loop...")
-            print(f"Press Ctrl+C to stop the scraper safely")
-            print(f"{'=' * 50}")
+        logger.info(f"\n{'=' * 50}")
+        logger.info(f"Starting infinite scraping loop with {settings.CONCURRENCY} worker(s)...")
+        logger.info(f"Press Ctrl+C to stop the scraper safely")
+        logger.info(f"{'=' * 50}")
 
-            i = 0
+        context_options = {
+            'viewport': {'width': settings.WINDOW_WIDTH, 'height': settings.WINDOW_HEIGHT},
+            'user_agent': settings.USER_AGENT
+        }
+
+        # One warm context per worker, recycled between accounts.
+        # With TOR, contexts are spread across SOCKS ports for circuit isolation.
+        pool = ContextPool(
+            browser,
+            context_options,
+            settings.CONCURRENCY,
+            settings.CONTEXT_MAX_USES,
+            proxy_servers=settings.TOR_SOCKS_SERVERS if self.use_tor else None,
+            blocked_resource_types=settings.BLOCKED_RESOURCE_TYPES
+        )
+
+        # Shared across workers so API key numbers stay unique
+        counter = itertools.count(1)
+        workers = [
+            asyncio.create_task(self._worker(pool, worker_id, counter))
+            for worker_id in range(1, settings.CONCURRENCY + 1)
+        ]
+        workers.append(asyncio.create_task(self._flusher()))
+        try:
+            # Workers only return by raising; surface the first failure
+            done, _ = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        except KeyboardInterrupt:
+            logger.info("\n\nStopping scraper due to KeyboardInterrupt...")
+        finally:
+            if self._recovery_task is not None:
+                workers.append(self._recovery_task)
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
             try:
-                while True:
-                    i += 1
-                    print(f"\n{'=' * 50}")
-                    print(f"Generating API key #{i}")
-                    print(f"{'=' * 50}")
-                    sys.stdout.flush()  # Ensure logs appear immediately
-
-                    # Create a fresh browser context for each account to ensure isolation
-                    context_options = {
-                        'viewport': {'width': settings.WINDOW_WIDTH, 'height': settings.WINDOW_HEIGHT},
-                        'user_agent': settings.USER_AGENT
-                    }
-                    
-                    # Add proxy to context if using TOR
-                    if self.use_tor:
-                        context_options['proxy'] = settings.TOR_PROXIES
-                    
-                    context = await browser.new_context(**context_options)
-                    page = await context.new_page()
-
-                    error_occurred = False
-
-                    try:
-                        account = await self.create_account_and_get_key(page)
-                        self.save_api_key_to_db(account)  # This will raise exception if save fails
-                        print(f"\n{'=' * 50}")
-                        print(f"✓ Successfully generated and saved API key #{i}")
-                        print(f"{'=' * 50}")
-                        sys.stdout.flush()  # Ensure success message appears immediately
-                    except Exception as e:
-                        error_occurred = True
-                        print(f"\n{'=' * 50}")
-                        print(f"✗ Error generating API key #{i}")
-                        print(f"Error type: {type(e).__name__}")
-                        print(f"Error message: {str(e)}")
-                        try:
-                            print(f"Current URL: {page.url}")
-                        except:
-                            pass
-                        
-                        # Take screenshot on error for debugging
-                        try:
-                            screenshot_filename = f"error_screenshot_{i}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-                            screenshot_path = self.error_images_dir / screenshot_filename
-                            await page.screenshot(path=str(screenshot_path))
-                            print(f"Screenshot saved: {screenshot_path}")
-                        except:
-                            pass
-                        
-                        print(f"{'=' * 50}")
-                        
-                        # Handle error recovery (TOR renewal or countdown)
-                        await self.handle_error_recovery()
-                        
-                    finally:
-                        # Close context to clear all cookies and session data
-                        await context.close()
-
-                    # Small delay between requests (if no error occurred)
-                    # If error occurred, we already waited heavily
-                    if not error_occurred:
-                        await asyncio.sleep(settings.DELAY_BETWEEN_REQUESTS)
-
-            except KeyboardInterrupt:
-                print("\n\nStopping scraper due to KeyboardInterrupt...")
+                # Save whatever is still queued before shutting down
+                try:
+                    await self.flush_api_keys()
+                except Exception:
+                    await self.dump_pending_accounts()
+                    raise
             finally:
+                # Keep the last error screenshots when the session ends
+                await self.save_error_screenshots()
+                await pool.close()
                 await browser.close()
 
-        print(f"\n{'=' * 50}")
-        print(f"Scraping session ended. Total attempts: {i}")
-        print(f"{'=' * 50}")
\ No newline at end of file
+        logger.info(f"\n{'=' * 50}")
+        logger.info(f"Scraping session ended. Total attempts: {self.attempts}")
+        logger.info(f"{'=' * 50}")
+
+    async def _worker(self, pool: ContextPool, worker_id: int, counter: Iterator[int]):
+        """
+        Generate API keys in a loop, each account in a clean pooled browser context
+        and on the page that context keeps open between accounts.
+
+        Args:
+            pool: Context pool shared by all workers
+            worker_id: Worker number, used to label log output
+            counter: Shared counter numbering API key attempts
+        """
+        consecutive_errors = 0
+        while True:
+            # Hold off while a rate-limit recovery is running
+            await self._rate_limit_clear.wait()
+            i = next(counter)
+            self.attempts += 1
+            logger.info(f"\n{'=' * 50}")
+            logger.info(f"[Worker {worker_id}] Generating API key #{i}")
+            logger.info(f"{'=' * 50}")
+
+            context = await pool.acquire()
+            page = await pool.get_page(context)
+
+            error_occurred = False
+            rate_limited = False
+
+            def on_response(response):
+                nonlocal rate_limited
+                # Third-party scripts may 429 on their own; only the site's responses count
+                if (response.status in settings.RATE_LIMIT_STATUS_CODES
+                        and response.url.startswith(self.base_url)):
+                    rate_limited = True
+
+            page.on("response", on_response)
+
+            try:
+                account = await self.create_account_and_get_key(page)
+                logger.info(f"\n{'=' * 50}")
+                logger.info(f"✓ [Worker {worker_id}] Successfully generated API key #{i}")
+                logger.info(f"{'=' * 50}")
+            except Exception as e:
+                error_occurred = True
+                consecutive_errors += 1
+                logger.error(f"\n{'=' * 50}")
+                logger.error(f"✗ [Worker {worker_id}] Error generating API key #{i}")
+                logger.error(f"Error type: {type(e).__name__}")
+                logger.error(f"Error message: {str(e)}")
+                try:
+                    logger.error(f"Current URL: {page.url}")
+                except:
+                    pass
+                
+                # Take screenshot on error for debugging; kept in memory unless the error recurs
+                try:
+                    screenshot_filename = f"error_screenshot_{i}_{time.strftime(settings.SCREENSHOT_TIME_FORMAT)}.jpg"
+                    screenshot = await page.screenshot(type="jpeg", quality=settings.ERROR_SCREENSHOT_QUALITY)
+                    message_lines = str(e).strip().splitlines()
+                    signature = f"{type(e).__name__}: {message_lines[0] if message_lines else ''}"
+                    await self.record_error_screenshot(signature, screenshot_filename, screenshot)
+                except:
+                    pass
+                
+                logger.error(f"{'=' * 50}")
+                
+                if rate_limited or consecutive_errors >= settings.MAX_CONSECUTIVE_ERRORS:
+                    # Confirmed or persistent rate limit: every worker pauses for recovery
+                    logger.warning(f"[Worker {worker_id}] Rate limit detected, pausing all workers")
+                    consecutive_errors = 0
+                    self.start_rate_limit_recovery()
+                else:
+                    # Isolated error: only this worker backs off briefly
+                    await asyncio.sleep(settings.TRANSIENT_ERROR_RETRY_DELAY)
+                
+            finally:
+                page.remove_listener("response", on_response)
+                # Reset the context for reuse, or replace it if this account failed
+                await pool.release(context, healthy=not error_occurred)
+
+            # Small delay between requests (if no error occurred)
+            # If error occurred, we already backed off or paused for recovery
+            if not error_occurred:
+                consecutive_errors = 0
+                # Outside the error handling above: a failed save must stop the scraper
+                await self.save_api_key_to_db(account)
+                await asyncio.sleep(settings.DELAY_BETWEEN_REQUESTS)
@@ -8,8 +8,16 @@ Usage:
 
 import asyncio
 import sys
-from core import BytezAPIKeyScraper
+from core import BytezAPIKeyScraper, close_db_manager, stop_playwright
 from config import settings
+from config.logging_config import setup_logging
+
+# uvloop is optional (it does not support Windows); fall back to the default loop
+try:
+    import uvloop
+    run = uvloop.run
+except ImportError:
+    run = asyncio.run
 
 
 async def main():
@@ -20,6 +28,7 @@ async def main():
     print("=" * 60)
     print(f"Configuration:")
     print(f"  - Mode: Infinite Loop (Press Ctrl+C to stop)")
+    print(f"  - Workers: {settings.CONCURRENCY}")
     print(f"  - Browser type: {settings.BROWSER_TYPE}")
     if settings.BROWSER_EXECUTABLE_PATH:
         print(f"  - Browser path: {settings.BROWSER_EXECUTABLE_PATH}")
@@ -35,6 +44,9 @@ async def main():
     except KeyboardInterrupt:
         # This catches the interrupt if it bubbles up from scraper
         print("\nOperation cancelled by user.")
+    finally:
+        await stop_playwright()
+        await close_db_manager()
     
     print()
     print("=" * 60)
@@ -44,4 +56,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    setup_logging()
+    run(main())
@@ -1,19 +1,29 @@
 """
 Web Service wrapper for Bytez API Key Scraper
-Runs a Flask HTTP server to satisfy Render's Web Service requirements
-while running the scraper in a background thread
+Runs a Quart HTTP server to satisfy Render's Web Service requirements
+while running the scraper as a task on the same event loop
 """
 
 import asyncio
-import threading
 import os
 import sys
 import traceback
-from flask import Flask, jsonify
+from typing import Optional
+from quart import Quart, jsonify
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
 from datetime import datetime
-from core import BytezAPIKeyScraper
+from core import BytezAPIKeyScraper, close_db_manager, stop_playwright
+from config.logging_config import setup_logging
 
-app = Flask(__name__)
+# uvloop is optional (it does not support Windows); fall back to the default loop
+try:
+    import uvloop
+    run = uvloop.run
+except ImportError:
+    run = asyncio.run
+
+app = Quart(__name__)
 
 # Global status tracking
 scraper_status = {
@@ -21,86 +31,98 @@ scraper_status = {
     "started_at": datetime.now().isoformat(),
     "keys_scraped": 0,
     "last_error": None,
-    "last_success": None,
-    "thread_alive": False
+    "last_success": None
 }
 
-def run_scraper():
+# Scraper task, running on the server's event loop
+scraper_task: Optional[asyncio.Task] = None
+
+def scraper_alive() -> bool:
+    """Whether the scraper task is still running"""
+    return scraper_task is not None and not scraper_task.done()
+
+async def run_scraper():
     """Run the scraper in the background"""
-    global scraper_status
-    
     print("=" * 60)
-    print("SCRAPER THREAD STARTED")
+    print("SCRAPER TASK STARTED")
     print("=" * 60)
     sys.stdout.flush()
     
-    scraper_status["thread_alive"] = True
-    
-    async def scrape():
-        try:
-            print("Initializing scraper status to 'running'...")
-            sys.stdout.flush()
-            scraper_status["status"] = "running"
-            
-            print("Creating BytezAPIKeyScraper instance...")
-            sys.stdout.flush()
-            scraper = BytezAPIKeyScraper()
-            
-            print("Starting scraper.scrape_keys()...")
-            sys.stdout.flush()
-            await scraper.scrape_keys()
-            
-        except KeyboardInterrupt:
-            scraper_status["status"] = "stopped"
-            print("\n[SCRAPER] Stopped by user")
-            sys.stdout.flush()
-        except Exception as e:
-            scraper_status["status"] = "error"
-            scraper_status["last_error"] = str(e)
-            error_trace = traceback.format_exc()
-            print(f"\n[SCRAPER ERROR] {e}")
-            print(f"[SCRAPER ERROR TRACEBACK]\n{error_trace}")
-            sys.stdout.flush()
-    
     try:
-        # Run the async scraper
-        print("Starting asyncio.run(scrape())...")
+        print("Initializing scraper status to 'running'...")
+        sys.stdout.flush()
+        scraper_status["status"] = "running"
+        
+        print("Creating BytezAPIKeyScraper instance...")
         sys.stdout.flush()
-        asyncio.run(scrape())
+        # The constructor makes blocking MongoDB calls; keep them off the server's loop
+        scraper = await asyncio.to_thread(BytezAPIKeyScraper)
+        
+        print("Starting scraper.scrape_keys()...")
+        sys.stdout.flush()
+        await scraper.scrape_keys()
+        
+    except asyncio.CancelledError:
+        scraper_status["status"] = "stopped"
+        print("\n[SCRAPER] Stopped with the web service")
+        sys.stdout.flush()
+        raise
     except Exception as e:
         scraper_status["status"] = "error"
-        scraper_status["last_error"] = f"Asyncio error: {str(e)}"
+        scraper_status["last_error"] = str(e)
         error_trace = traceback.format_exc()
-        print(f"\n[ASYNCIO ERROR] {e}")
-        print(f"[ASYNCIO ERROR TRACEBACK]\n{error_trace}")
+        print(f"\n[SCRAPER ERROR] {e}")
+        print(f"[SCRAPER ERROR TRACEBACK]\n{error_trace}")
         sys.stdout.flush()
     finally:
-        scraper_status["thread_alive"] = False
+        await stop_playwright()
+        await close_db_manager()
         print("=" * 60)
-        print("SCRAPER THREAD ENDED")
+        print("SCRAPER TASK ENDED")
         print("=" * 60)
         sys.stdout.flush()
 
+@app.before_serving
+async def start_scraper():
+    """Start the scraper once the server is up"""
+    global scraper_task
+    # Here rather than under __main__ so "hypercorn web_service:app" gets log output too
+    setup_logging()
+    print("\nStarting scraper task...")
+    sys.stdout.flush()
+    scraper_task = asyncio.create_task(run_scraper())
+
+@app.after_serving
+async def stop_scraper():
+    """Stop the scraper, letting it flush queued keys, when the server shuts down"""
+    if scraper_alive():
+        scraper_task.cancel()
+        try:
+            await scraper_task
+        except asyncio.CancelledError:
+            pass
+
 @app.route('/')
-def home():
+async def home():
     """Health check endpoint"""
     return jsonify({
         "service": "Bytez API Key Scraper",
         "status": scraper_status["status"],
         "started_at": scraper_status["started_at"],
-        "thread_alive": scraper_status["thread_alive"],
+        "thread_alive": scraper_alive(),
         "uptime": "running"
     })
 
 @app.route('/health')
-def health():
+async def health():
     """Health check for Render"""
     return jsonify({"status": "healthy"}), 200
 
 @app.route('/status')
-def status():
+async def status():
     """Get scraper status"""
-    return jsonify(scraper_status)
+    # "thread_alive" kept for existing consumers; it now tracks the scraper task
+    return jsonify({**scraper_status, "thread_alive": scraper_alive()})
 
 if __name__ == '__main__':
     print("=" * 60)
@@ -117,16 +139,11 @@ if __name__ == '__main__':
     print(f"MongoDB URL: {mongodb_url[:50]}..." if len(mongodb_url) > 50 else f"MongoDB URL: {mongodb_url}")
     print(f"MongoDB Database: {mongodb_db}")
     
-    # Start scraper in background thread
-    print("\nStarting scraper thread...")
-    sys.stdout.flush()
-    scraper_thread = threading.Thread(target=run_scraper, daemon=True)
-    scraper_thread.start()
-    print(f"Scraper thread started: {scraper_thread.is_alive()}")
-    
-    print(f"\nStarting Flask web service on port {port}...")
+    print(f"\nStarting Quart web service on port {port}...")
     print("=" * 60)
     sys.stdout.flush()
     
-    # Run Flask app
-    app.run(host='0.0.0.0', port=port)
+    # Serve the app with hypercorn; the scraper starts in before_serving
+    config = Config()
+    config.bind = [f"0.0.0.0:{port}"]
+    run(serve(app, config))